@@ -2,15 +2,20 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Configuration manager for usbipd bound devices."""
 
+import json
 import os
+import stat
+import tempfile
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from collections.abc import Iterator
+from typing import Any
 
 
 class BindingConfiguration:
     """Manages the configuration file for bound USB devices."""
 
-    DEFAULT_CONFIG_PATH = os.path.expanduser("~/.config/usbipd/bindings.xml")
+    DEFAULT_CONFIG_PATH = os.path.expanduser("~/.config/usbipd/bindings.json")
+    LEGACY_CONFIG_PATH = os.path.expanduser("~/.config/usbipd/bindings.xml")
 
     def __init__(self, config_path: str | None = None) -> None:
         """
@@ -18,52 +23,169 @@ class BindingConfiguration:
 
         Args:
             config_path: Optional path to the configuration file.
-                        Defaults to ~/.config/usbipd/bindings.xml
+                        Defaults to ~/.config/usbipd/bindings.json
         """
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
+        self._config: dict[str, Any] | None = None
+        self._bindings: list[dict] = []
+        self._index: dict[tuple[str, str, str], dict] = {}
+        self._mtime_ns = 0
         self._ensure_config_exists()
 
     def _ensure_config_exists(self) -> None:
-        """Ensure the configuration file and its directory exist."""
+        """Ensure the configuration file and its directory exist.
+
+        If the default JSON file is missing but a legacy XML file from an
+        earlier version exists, its bindings are migrated.
+        """
         config_dir = os.path.dirname(self.config_path)
         if config_dir and not os.path.exists(config_dir):
             os.makedirs(config_dir, exist_ok=True)
 
         if not os.path.exists(self.config_path):
-            self._create_empty_config()
+            if self.config_path == self.DEFAULT_CONFIG_PATH and os.path.exists(
+                self.LEGACY_CONFIG_PATH
+            ):
+                self._migrate_legacy_config(self.LEGACY_CONFIG_PATH)
+            else:
+                self._create_empty_config()
 
     def _create_empty_config(self) -> None:
-        """Create an empty configuration file with the root element."""
-        root = ET.Element("usbipd")
-        root.set("version", "1.0")
-        ET.SubElement(root, "bindings")
-        self._write_config(root)
+        """Create an empty configuration file."""
+        self._write_config({"version": "1.0", "bindings": []})
+
+    def _migrate_legacy_config(self, legacy_path: str) -> None:
+        """
+        Convert a legacy XML bindings file to the JSON format.
+
+        The legacy file is renamed with a ".migrated" suffix afterwards, so
+        deleting the JSON file later does not bring its bindings back.
+
+        Args:
+            legacy_path: Path to the legacy XML configuration file.
+        """
+        self._write_config({"version": "1.0", "bindings": self._load_legacy_bindings(legacy_path)})
+        os.replace(legacy_path, f"{legacy_path}.migrated")
 
-    def _write_config(self, root: ET.Element) -> None:
+    def _load_legacy_bindings(self, legacy_path: str) -> list[dict]:
+        """
+        Read the bindings from a legacy XML file.
+
+        The file is streamed with iterparse and each device element is
+        cleared once read, so the full tree is never held in memory.
+
+        Args:
+            legacy_path: Path to the legacy XML configuration file.
+
+        Returns:
+            A list of dictionaries containing binding information.
+        """
+        bindings = []
+        for _event, element in ET.iterparse(legacy_path, events=("end",)):
+            if element.tag == "device":
+                bindings.append(self._binding_to_dict(element.attrib))
+                element.clear()
+        return bindings
+
+    def _write_config(self, config: dict[str, Any]) -> None:
         """
-        Write the XML configuration to file with pretty formatting.
+        Write the JSON configuration to file.
+
+        The document is written to a temporary file in the same directory and
+        renamed into place, so a crash mid-write never leaves a truncated file.
+        The existing file's mode and owner are carried over to the new file.
 
         Args:
-            root: The root XML element to write.
+            config: The configuration document to write.
+        """
+        config_dir = os.path.dirname(self.config_path) or "."
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=config_dir, prefix=".bindings-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as config_file:
+                json.dump(config, config_file, indent=2)
+                config_file.write("\n")
+            self._copy_file_attributes(temporary_path)
+            os.replace(temporary_path, self.config_path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+        self._set_config(config)
+        self._mtime_ns = os.stat(self.config_path).st_mtime_ns
+
+    def _copy_file_attributes(self, temporary_path: str) -> None:
         """
-        xml_string = ET.tostring(root, encoding="unicode")
-        pretty_xml = minidom.parseString(xml_string).toprettyxml(indent="  ")
-        # Remove extra blank lines that minidom adds
-        lines = [line for line in pretty_xml.split("\n") if line.strip()]
-        formatted_xml = "\n".join(lines) + "\n"
+        Give a replacement file the mode and owner of the configuration file.
 
-        with open(self.config_path, "w", encoding="utf-8") as config_file:
-            config_file.write(formatted_xml)
+        Without this, the replacement would keep the private mode of a
+        temporary file, and a command run with sudo would leave a file that
+        the user can no longer read. New files get the default mode for the
+        current umask.
 
-    def _load_config(self) -> ET.Element:
+        Args:
+            temporary_path: Path to the file that will replace the configuration.
+        """
+        try:
+            current = os.stat(self.config_path)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temporary_path, 0o666 & ~umask)
+            return
+
+        os.chmod(temporary_path, stat.S_IMODE(current.st_mode))
+        if hasattr(os, "chown"):
+            try:
+                os.chown(temporary_path, current.st_uid, current.st_gid)
+            except PermissionError:
+                # Only a privileged user can hand the file to another owner
+                pass
+
+    def _load_config(self) -> dict[str, Any]:
         """
         Load the configuration file.
 
+        The parsed document is cached and only re-read when the file's
+        modification time changes.
+
         Returns:
-            The root XML element.
+            The configuration document.
         """
-        tree = ET.parse(self.config_path)
-        return tree.getroot()
+        mtime_ns = os.stat(self.config_path).st_mtime_ns
+        if self._config is None or mtime_ns != self._mtime_ns:
+            with open(self.config_path, encoding="utf-8") as config_file:
+                config: dict[str, Any] = json.load(config_file)
+            self._set_config(config)
+            self._mtime_ns = mtime_ns
+            return config
+        return self._config
+
+    def _set_config(self, config: dict[str, Any]) -> None:
+        """
+        Cache a configuration document and index its bindings by identity.
+
+        The bindings list is kept alongside the document so callers do not
+        need to look it up again.
+
+        Args:
+            config: The configuration document.
+        """
+        self._config = config
+        self._bindings = config.setdefault("bindings", [])
+        self._index = {self._binding_identity(binding): binding for binding in self._bindings}
+
+    def _load_index(self) -> dict[tuple[str, str, str], dict]:
+        """
+        Load the configuration and return its bindings indexed by identity.
+
+        Returns:
+            A dictionary mapping (vendor_id, product_id, serial_number)
+            tuples to the stored binding records.
+        """
+        self._load_config()
+        return self._index
 
     def add_binding(self, vendor_id: str, product_id: str, serial_number: str = "") -> bool:
         """
@@ -79,30 +201,42 @@ class BindingConfiguration:
         Returns:
             True if the binding was added, False if it already exists.
         """
-        root = self._load_config()
-        bindings = root.find("bindings")
+        return self.add_bindings([(vendor_id, product_id, serial_number)]) == 1
 
-        if bindings is None:
-            bindings = ET.SubElement(root, "bindings")
-
-        # Check if binding already exists (same VID:PID:serial)
-        for device in bindings.findall("device"):
-            if (
-                device.get("vendor_id") == vendor_id
-                and device.get("product_id") == product_id
-                and device.get("serial_number", "") == serial_number
-            ):
-                return False
+    def add_bindings(self, identities: list[tuple[str, str, str]]) -> int:
+        """
+        Add multiple device bindings to the configuration in one write.
 
-        # Add new binding
-        device_element = ET.SubElement(bindings, "device")
-        device_element.set("vendor_id", vendor_id)
-        device_element.set("product_id", product_id)
-        if serial_number:
-            device_element.set("serial_number", serial_number)
+        Args:
+            identities: A list of (vendor_id, product_id, serial_number) tuples.
+                        Use an empty serial number for devices without one.
 
-        self._write_config(root)
-        return True
+        Returns:
+            The number of bindings that were added. Identities that are
+            already bound are skipped.
+        """
+        config = self._load_config()
+        bindings = self._bindings
+        index = self._index
+
+        added_count = 0
+        for identity in identities:
+            if identity in index:
+                continue
+
+            vendor_id, product_id, serial_number = identity
+            binding = {
+                "vendor_id": vendor_id,
+                "product_id": product_id,
+                "serial_number": serial_number,
+            }
+            bindings.append(binding)
+            index[identity] = binding
+            added_count += 1
+
+        if added_count:
+            self._write_config(config)
+        return added_count
 
     def remove_binding(self, vendor_id: str, product_id: str, serial_number: str = "") -> bool:
         """
@@ -116,23 +250,15 @@ class BindingConfiguration:
         Returns:
             True if the binding was removed, False if it was not found.
         """
-        root = self._load_config()
-        bindings = root.find("bindings")
+        config = self._load_config()
+        binding = self._index.pop((vendor_id, product_id, serial_number), None)
 
-        if bindings is None:
+        if binding is None:
             return False
 
-        for device in bindings.findall("device"):
-            if (
-                device.get("vendor_id") == vendor_id
-                and device.get("product_id") == product_id
-                and device.get("serial_number", "") == serial_number
-            ):
-                bindings.remove(device)
-                self._write_config(root)
-                return True
-
-        return False
+        self._bindings.remove(binding)
+        self._write_config(config)
+        return True
 
     def get_binding(self, vendor_id: str, product_id: str, serial_number: str = "") -> dict | None:
         """
@@ -146,21 +272,8 @@ class BindingConfiguration:
         Returns:
             A dictionary with the binding information, or None if not found.
         """
-        root = self._load_config()
-        bindings = root.find("bindings")
-
-        if bindings is None:
-            return None
-
-        for device in bindings.findall("device"):
-            if (
-                device.get("vendor_id") == vendor_id
-                and device.get("product_id") == product_id
-                and device.get("serial_number", "") == serial_number
-            ):
-                return self._device_element_to_dict(device)
-
-        return None
+        binding = self._load_index().get((vendor_id, product_id, serial_number))
+        return self._binding_to_dict(binding) if binding is not None else None
 
     def get_all_bindings(self) -> list[dict]:
         """
@@ -169,13 +282,28 @@ class BindingConfiguration:
         Returns:
             A list of dictionaries containing binding information.
         """
-        root = self._load_config()
-        bindings = root.find("bindings")
+        return list(self.iter_bindings())
+
+    def iter_bindings(self) -> Iterator[dict]:
+        """
+        Iterate over all device bindings.
 
-        if bindings is None:
-            return []
+        Yields:
+            A dictionary containing binding information for each binding.
+        """
+        self._load_config()
+        for binding in self._bindings:
+            yield self._binding_to_dict(binding)
 
-        return [self._device_element_to_dict(device) for device in bindings.findall("device")]
+    def get_bound_identities(self) -> set[tuple[str, str, str]]:
+        """
+        Get the identities of all bound devices.
+
+        Returns:
+            A set of (vendor_id, product_id, serial_number) tuples, suitable
+            for constant-time membership tests.
+        """
+        return set(self._load_index())
 
     def is_bound(self, vendor_id: str, product_id: str, serial_number: str = "") -> bool:
         """
@@ -198,29 +326,70 @@ class BindingConfiguration:
         Returns:
             The number of bindings that were removed.
         """
-        root = self._load_config()
-        bindings = root.find("bindings")
+        config = self._load_config()
 
-        if bindings is None:
-            return 0
-
-        device_count = len(bindings.findall("device"))
-        bindings.clear()
-        self._write_config(root)
+        device_count = len(self._bindings)
+        if device_count:
+            self._bindings.clear()
+            self._write_config(config)
         return device_count
 
-    def _device_element_to_dict(self, device: ET.Element) -> dict:
+    @staticmethod
+    def _binding_identity(binding: dict) -> tuple[str, str, str]:
+        """
+        Get the VID:PID:serial identity of a stored binding.
+
+        Args:
+            binding: The stored binding record.
+
+        Returns:
+            A (vendor_id, product_id, serial_number) tuple.
         """
-        Convert a device XML element to a dictionary.
+        return (
+            binding.get("vendor_id", ""),
+            binding.get("product_id", ""),
+            binding.get("serial_number", ""),
+        )
+
+    @staticmethod
+    def _binding_to_dict(binding: dict) -> dict:
+        """
+        Convert a stored binding record to a normalized dictionary.
 
         Args:
-            device: The device XML element.
+            binding: The stored binding record or legacy XML attributes.
 
         Returns:
             A dictionary containing the device information.
         """
         return {
-            "vendor_id": device.get("vendor_id", ""),
-            "product_id": device.get("product_id", ""),
-            "serial_number": device.get("serial_number", ""),
+            "vendor_id": binding.get("vendor_id", ""),
+            "product_id": binding.get("product_id", ""),
+            "serial_number": binding.get("serial_number", ""),
         }
+
+
+# Configuration instances shared within this process, keyed by file path
+_CONFIG_CACHE: dict[str, BindingConfiguration] = {}
+
+
+def get_binding_configuration(config_path: str | None = None) -> BindingConfiguration:
+    """
+    Get the shared BindingConfiguration instance for a configuration file.
+
+    Each instance re-reads its file only when the modification time changes,
+    so sharing one per path avoids parsing the file again for every command
+    run in the same process.
+
+    Args:
+        config_path: Optional path to the configuration file.
+                    Defaults to ~/.config/usbipd/bindings.json
+
+    Returns:
+        The BindingConfiguration instance for the file.
+    """
+    path = config_path or BindingConfiguration.DEFAULT_CONFIG_PATH
+    config = _CONFIG_CACHE.get(path)
+    if config is None or not os.path.exists(path):
+        config = _CONFIG_CACHE[path] = BindingConfiguration(path)
+    return config
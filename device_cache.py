@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: 2025 Alexander Brinkman
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Persistent cache of USB string descriptors across usbipd invocations."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Per-device properties in `ioreg -p IOUSB -l` output that identify the
+# topology: the port location, and a session ID that changes on every attach
+IOREG_TOPOLOGY_RE = re.compile(r'"(?:locationID|sessionID)" = \d+')
+
+
+class DeviceEnumerationCache:
+    """Stores USB string descriptors on disk, keyed by the USB topology.
+
+    Reading string descriptors requires a control transfer to every device,
+    which dominates the run time of short CLI invocations. The cache is only
+    used while the USB topology fingerprint is unchanged, so any device being
+    attached, removed or re-enumerated invalidates it.
+
+    The fingerprint is derived from sysfs on Linux and from the IOUSB
+    registry plane on macOS; on other platforms the cache is disabled.
+    """
+
+    DEFAULT_CACHE_PATH = os.path.expanduser("~/.cache/usbipd/enum.json")
+    SYSFS_USB_DEVICES = "/sys/bus/usb/devices"
+    IOREG_COMMAND = ("ioreg", "-p", "IOUSB", "-l", "-w", "0")
+
+    def __init__(self, cache_path: str | None = None) -> None:
+        """
+        Initialize the DeviceEnumerationCache instance.
+
+        Args:
+            cache_path: Optional path to the cache file.
+                        Defaults to ~/.cache/usbipd/enum.json
+        """
+        self.cache_path = cache_path or self.DEFAULT_CACHE_PATH
+        self._fingerprint: str | None = None
+        self._loaded: dict[tuple[int, tuple[int, ...], int, int], str] | None = None
+
+    @classmethod
+    def compute_fingerprint(cls) -> str | None:
+        """
+        Compute a fingerprint of the current USB topology.
+
+        Returns:
+            A hex digest, or None if no fingerprint is available.
+        """
+        if sys.platform.startswith("linux"):
+            return cls._compute_sysfs_fingerprint()
+        if sys.platform == "darwin":
+            return cls._compute_ioreg_fingerprint()
+        return None
+
+    @classmethod
+    def _compute_sysfs_fingerprint(cls) -> str | None:
+        """
+        Fingerprint the USB topology from sysfs.
+
+        Every attached device has an entry in sysfs that is recreated
+        whenever the device is re-enumerated, so the entry names and their
+        timestamps identify the topology.
+
+        Returns:
+            A hex digest, or None if sysfs could not be read.
+        """
+        digest = hashlib.sha256()
+        try:
+            with os.scandir(cls.SYSFS_USB_DEVICES) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                    digest.update(f"{entry.name}:{mtime_ns}\n".encode())
+        except OSError as error:
+            logger.debug("Could not fingerprint USB topology: %s", error)
+            return None
+        return digest.hexdigest()
+
+    @classmethod
+    def _compute_ioreg_fingerprint(cls) -> str | None:
+        """
+        Fingerprint the USB topology from the macOS I/O Registry.
+
+        Only the location and session IDs of each device are hashed, since
+        other properties, such as power state, change while devices are idle.
+
+        Returns:
+            A hex digest, or None if ioreg could not be run.
+        """
+        try:
+            result = subprocess.run(
+                cls.IOREG_COMMAND, capture_output=True, text=True, check=True, timeout=5
+            )
+        except (OSError, subprocess.SubprocessError) as error:
+            logger.debug("Could not fingerprint USB topology: %s", error)
+            return None
+
+        digest = hashlib.sha256()
+        for match in IOREG_TOPOLOGY_RE.finditer(result.stdout):
+            digest.update(f"{match.group(0)}\n".encode())
+        return digest.hexdigest()
+
+    def load(self) -> dict[tuple[int, tuple[int, ...], int, int], str]:
+        """
+        Load the cached string descriptors if the topology is unchanged.
+
+        The fingerprint computed here is reused by save(), so the topology is
+        only inspected once per invocation.
+
+        Returns:
+            A dictionary mapping (bus, port path, address, descriptor index)
+            to the cleaned string, or an empty dictionary if there is no
+            valid cache.
+        """
+        self._fingerprint = self.compute_fingerprint()
+        self._loaded = {}
+        if self._fingerprint is None:
+            return {}
+
+        try:
+            with open(self.cache_path, encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get("fingerprint") != self._fingerprint:
+            return {}
+
+        try:
+            self._loaded = {
+                (int(bus), tuple(int(port) for port in ports), int(address), int(index)): str(value)
+                for bus, ports, address, index, value in data.get("strings", [])
+            }
+        except (TypeError, ValueError) as error:
+            logger.debug("Ignoring malformed device cache: %s", error)
+            return {}
+        return dict(self._loaded)
+
+    def save(self, strings: dict[tuple[int, tuple[int, ...], int, int], str]) -> None:
+        """
+        Save string descriptors together with the topology fingerprint.
+
+        Nothing is written unless load() was called first, or if the strings
+        equal those it returned. The file is written to a unique temporary
+        path and renamed into place, so concurrent readers and writers never
+        see a partial file.
+
+        Args:
+            strings: A dictionary mapping (bus, port path, address,
+                     descriptor index) to the cleaned string.
+        """
+        if self._fingerprint is None or self._loaded is None or strings == self._loaded:
+            return
+
+        data = {
+            "fingerprint": self._fingerprint,
+            "strings": [
+                [bus, list(ports), address, index, value]
+                for (bus, ports, address, index), value in strings.items()
+            ],
+        }
+        cache_dir = os.path.dirname(self.cache_path) or "."
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=cache_dir, prefix=".enum-", suffix=".tmp"
+            )
+        except OSError as error:
+            logger.debug("Could not write device cache: %s", error)
+            return
+
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(temporary_path, self.cache_path)
+        except OSError as error:
+            logger.debug("Could not write device cache: %s", error)
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
+            return
+        self._loaded = dict(strings)
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2025 Alexander Brinkman
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Tests for the bound device configuration."""
+
+import os
+import stat
+
+import pytest
+
+from binding_configuration import BindingConfiguration, get_binding_configuration
+
+
+@pytest.fixture
+def config_path(tmp_path: os.PathLike) -> str:
+    """Path of a configuration file in a not yet existing directory."""
+    return os.path.join(tmp_path, "usbipd", "bindings.json")
+
+
+def test_new_file_follows_umask(config_path: str) -> None:
+    umask = os.umask(0o022)
+    try:
+        BindingConfiguration(config_path)
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(os.stat(config_path).st_mode) == 0o644
+
+
+def test_write_keeps_file_mode(config_path: str) -> None:
+    config = BindingConfiguration(config_path)
+    os.chmod(config_path, 0o640)
+
+    config.add_binding("1234", "5678", "SN1")
+
+    assert stat.S_IMODE(os.stat(config_path).st_mode) == 0o640
+
+
+def test_migrates_legacy_xml(tmp_path: os.PathLike, monkeypatch: pytest.MonkeyPatch) -> None:
+    json_path = os.path.join(tmp_path, "bindings.json")
+    xml_path = os.path.join(tmp_path, "bindings.xml")
+    monkeypatch.setattr(BindingConfiguration, "DEFAULT_CONFIG_PATH", json_path)
+    monkeypatch.setattr(BindingConfiguration, "LEGACY_CONFIG_PATH", xml_path)
+    with open(xml_path, "w", encoding="utf-8") as xml_file:
+        xml_file.write(
+            '<usbipd version="1.0"><bindings>'
+            '<device vendor_id="1234" product_id="5678" serial_number="SN1" />'
+            '<device vendor_id="abcd" product_id="0001" />'
+            "</bindings></usbipd>"
+        )
+
+    config = BindingConfiguration()
+
+    assert config.get_all_bindings() == [
+        {"vendor_id": "1234", "product_id": "5678", "serial_number": "SN1"},
+        {"vendor_id": "abcd", "product_id": "0001", "serial_number": ""},
+    ]
+    assert config.is_bound("abcd", "0001")
+    assert not os.path.exists(xml_path)
+    assert os.path.exists(f"{xml_path}.migrated")
+
+    # Resetting the JSON file does not bring the legacy bindings back
+    os.remove(json_path)
+    assert BindingConfiguration().get_all_bindings() == []
+
+
+def test_add_remove_clear(config_path: str) -> None:
+    config = BindingConfiguration(config_path)
+
+    assert config.add_binding("1234", "5678", "SN1")
+    assert not config.add_binding("1234", "5678", "SN1")
+    assert config.add_bindings([("1234", "5678", "SN2"), ("abcd", "0001", "")]) == 2
+    assert config.get_bound_identities() == {
+        ("1234", "5678", "SN1"),
+        ("1234", "5678", "SN2"),
+        ("abcd", "0001", ""),
+    }
+
+    assert config.remove_binding("1234", "5678", "SN1")
+    assert not config.remove_binding("1234", "5678", "SN1")
+    assert not config.is_bound("1234", "5678", "SN1")
+    assert config.get_binding("abcd", "0001") == {
+        "vendor_id": "abcd",
+        "product_id": "0001",
+        "serial_number": "",
+    }
+
+    # A fresh instance reads the same bindings from disk
+    assert BindingConfiguration(config_path).get_bound_identities() == {
+        ("1234", "5678", "SN2"),
+        ("abcd", "0001", ""),
+    }
+
+    assert config.clear_all_bindings() == 2
+    assert config.get_all_bindings() == []
+    assert BindingConfiguration(config_path).get_all_bindings() == []
+
+
+def test_reloads_when_file_changes(config_path: str) -> None:
+    config = BindingConfiguration(config_path)
+    assert config.get_all_bindings() == []
+
+    other = BindingConfiguration(config_path)
+    other.add_binding("1234", "5678", "SN1")
+    # Make sure the modification time differs on coarse-grained filesystems
+    mtime_ns = os.stat(config_path).st_mtime_ns + 1_000_000_000
+    os.utime(config_path, ns=(mtime_ns, mtime_ns))
+
+    assert config.is_bound("1234", "5678", "SN1")
+
+
+def test_shared_instance_recreated_after_delete(config_path: str) -> None:
+    config = get_binding_configuration(config_path)
+    config.add_binding("1234", "5678", "SN1")
+    assert get_binding_configuration(config_path) is config
+
+    os.remove(config_path)
+    recreated = get_binding_configuration(config_path)
+
+    assert recreated is not config
+    assert os.path.exists(config_path)
+    assert recreated.get_all_bindings() == []
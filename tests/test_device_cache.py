@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2025 Alexander Brinkman
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Tests for the persistent USB string descriptor cache."""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+import device_cache
+from device_cache import DeviceEnumerationCache
+
+STRINGS = {
+    (1, (2, 3), 4, 1): "Acme",
+    (1, (2, 3), 4, 2): "Widget",
+    (2, (), 1, 3): "SN1",
+}
+
+
+@pytest.fixture
+def fingerprint(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace the topology fingerprint with a value controlled by the test."""
+    value = ["topology-a"]
+    monkeypatch.setattr(
+        DeviceEnumerationCache, "compute_fingerprint", classmethod(lambda cls: value[0])
+    )
+    return value
+
+
+@pytest.fixture
+def cache_path(tmp_path: os.PathLike) -> str:
+    """Path of a cache file in a not yet existing directory."""
+    return os.path.join(tmp_path, "usbipd", "enum.json")
+
+
+def test_round_trip(fingerprint: list[str], cache_path: str) -> None:
+    writer = DeviceEnumerationCache(cache_path)
+    assert writer.load() == {}
+    writer.save(STRINGS)
+
+    assert DeviceEnumerationCache(cache_path).load() == STRINGS
+    assert os.listdir(os.path.dirname(cache_path)) == ["enum.json"]
+
+
+def test_fingerprint_mismatch(fingerprint: list[str], cache_path: str) -> None:
+    writer = DeviceEnumerationCache(cache_path)
+    writer.load()
+    writer.save(STRINGS)
+
+    fingerprint[0] = "topology-b"
+    assert DeviceEnumerationCache(cache_path).load() == {}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{not json",
+        "[]",
+        json.dumps({"fingerprint": "topology-a", "strings": [[1, 4, 1, "old format"]]}),
+        json.dumps({"fingerprint": "topology-a", "strings": [[1, ["x"], 4, 1, "Acme"]]}),
+    ],
+)
+def test_malformed_file(fingerprint: list[str], cache_path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(cache_path))
+    with open(cache_path, "w", encoding="utf-8") as cache_file:
+        cache_file.write(content)
+
+    assert DeviceEnumerationCache(cache_path).load() == {}
+
+
+def test_save_skipped_when_unchanged(
+    fingerprint: list[str], cache_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    writer = DeviceEnumerationCache(cache_path)
+    writer.load()
+    writer.save(STRINGS)
+
+    reader = DeviceEnumerationCache(cache_path)
+    reader.load()
+    monkeypatch.setattr(
+        device_cache.tempfile, "mkstemp", lambda *args, **kwargs: pytest.fail("cache rewritten")
+    )
+    reader.save(dict(STRINGS))
+
+
+def test_save_requires_load(fingerprint: list[str], cache_path: str) -> None:
+    DeviceEnumerationCache(cache_path).save(STRINGS)
+
+    assert not os.path.exists(cache_path)
+
+
+def test_sysfs_fingerprint(tmp_path: os.PathLike, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(device_cache.sys, "platform", "linux")
+    monkeypatch.setattr(DeviceEnumerationCache, "SYSFS_USB_DEVICES", str(tmp_path))
+    os.mkdir(os.path.join(tmp_path, "1-1"))
+    first = DeviceEnumerationCache.compute_fingerprint()
+
+    assert first is not None
+    assert DeviceEnumerationCache.compute_fingerprint() == first
+
+    os.mkdir(os.path.join(tmp_path, "1-2"))
+    assert DeviceEnumerationCache.compute_fingerprint() != first
+
+
+def test_ioreg_fingerprint(monkeypatch: pytest.MonkeyPatch) -> None:
+    output = ['  "locationID" = 337641472\n  "sessionID" = 1001\n  "Power" = 1\n']
+
+    def run(command: tuple[str, ...], **kwargs: object) -> subprocess.CompletedProcess:
+        return subprocess.CompletedProcess(command, 0, stdout=output[0])
+
+    monkeypatch.setattr(device_cache.sys, "platform", "darwin")
+    monkeypatch.setattr(device_cache.subprocess, "run", run)
+    first = DeviceEnumerationCache.compute_fingerprint()
+
+    # Volatile properties do not affect the fingerprint
+    output[0] = output[0].replace('"Power" = 1', '"Power" = 2')
+    assert DeviceEnumerationCache.compute_fingerprint() == first
+
+    # Re-attaching a device assigns a new session ID
+    output[0] = output[0].replace("1001", "1002")
+    assert DeviceEnumerationCache.compute_fingerprint() != first
+
+
+def test_ioreg_unavailable(monkeypatch: pytest.MonkeyPatch) -> None:
+    def run(command: tuple[str, ...], **kwargs: object) -> subprocess.CompletedProcess:
+        raise FileNotFoundError(command[0])
+
+    monkeypatch.setattr(device_cache.sys, "platform", "darwin")
+    monkeypatch.setattr(device_cache.subprocess, "run", run)
+
+    assert DeviceEnumerationCache.compute_fingerprint() is None
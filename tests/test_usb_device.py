@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2025 Alexander Brinkman
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Tests for USB device enumeration with mocked pyusb devices."""
+
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+import usb_device
+from usb_device import USBDeviceManager
+
+
+class FakeDevice:
+    """Minimal stand-in for a pyusb Device."""
+
+    def __init__(self, address: int, strings: tuple[str | None, str | None, str | None]) -> None:
+        self.bus = 1
+        self.port_numbers = [address]
+        self.address = address
+        self.idVendor = 0x1234
+        self.idProduct = address
+        self.iManufacturer, self.iProduct, self.iSerialNumber = (
+            index if value is not None else 0 for index, value in enumerate(strings, start=1)
+        )
+        self.strings = dict(enumerate(strings, start=1))
+
+
+class FakeUSB:
+    """Records string reads and resource releases made through pyusb."""
+
+    def __init__(self, devices: list[FakeDevice]) -> None:
+        self.devices = devices
+        self.reads: list[tuple[int, int]] = []
+        self.disposed: list[int] = []
+        self.read_delay = 0.0
+        self._lock = threading.Lock()
+
+    def find(self, find_all: bool = False, backend: object = None) -> Iterator[FakeDevice]:
+        return iter(self.devices)
+
+    def get_string(self, device: FakeDevice, index: int) -> str | None:
+        # Later devices answer first, so completion order differs from enumeration order
+        time.sleep(self.read_delay * (len(self.devices) - self.devices.index(device)))
+        with self._lock:
+            self.reads.append((device.address, index))
+        return device.strings[index]
+
+    def dispose_resources(self, device: FakeDevice) -> None:
+        with self._lock:
+            self.disposed.append(device.address)
+
+
+@pytest.fixture
+def fake_usb(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeUSB]:
+    """Replace pyusb enumeration and string reads with fakes."""
+    fake = FakeUSB([])
+    monkeypatch.setattr(usb_device.usb.core, "find", fake.find)
+    monkeypatch.setattr(usb_device.usb.util, "get_string", fake.get_string)
+    monkeypatch.setattr(usb_device.usb.util, "dispose_resources", fake.dispose_resources)
+    monkeypatch.setattr(usb_device, "get_backend", lambda: None)
+    monkeypatch.setattr(usb_device, "_STRING_CACHE", {})
+    usb_device._EnumerationCache.clear()
+    yield fake
+    usb_device._EnumerationCache.clear()
+
+
+def test_iter_devices_reads_in_parallel_and_keeps_order(fake_usb: FakeUSB) -> None:
+    fake_usb.devices = [FakeDevice(address, ("Acme", f"P{address}", None)) for address in (1, 2, 3)]
+    fake_usb.read_delay = 0.01
+
+    devices = list(USBDeviceManager().iter_devices())
+
+    assert [device.product for device in devices] == ["P1", "P2", "P3"]
+    assert sorted(fake_usb.reads) == [(1, 1), (1, 2), (2, 1), (2, 2), (3, 1), (3, 2)]
+    assert sorted(fake_usb.disposed) == [1, 2, 3]
+
+
+def test_iter_devices_single_read_is_inline(
+    fake_usb: FakeUSB, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fake_usb.devices = [FakeDevice(1, ("Acme", "Widget", "SN1"))]
+    monkeypatch.setattr(usb_device, "ThreadPoolExecutor", None)
+
+    devices = list(USBDeviceManager().iter_devices())
+
+    assert devices[0].serial_number == "SN1"
+    assert len(fake_usb.reads) == 3
+    assert fake_usb.disposed == [1]
+
+
+def test_iter_devices_skips_cached_strings(
+    fake_usb: FakeUSB, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fake_usb.devices = [FakeDevice(address, ("Acme", None, None)) for address in (1, 2)]
+    list(USBDeviceManager().iter_devices())
+    fake_usb.reads.clear()
+    fake_usb.disposed.clear()
+    monkeypatch.setattr(usb_device, "ThreadPoolExecutor", None)
+
+    devices = list(USBDeviceManager().iter_devices())
+
+    assert [device.manufacturer for device in devices] == ["Acme", "Acme"]
+    assert fake_usb.reads == []
+    assert fake_usb.disposed == []
+
+
+def test_iter_devices_cancels_queued_reads_when_closed(
+    fake_usb: FakeUSB, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fake_usb.devices = [FakeDevice(address, (None, None, f"SN{address}")) for address in range(6)]
+    fake_usb.read_delay = 0.02
+    monkeypatch.setattr(USBDeviceManager, "PREFETCH_WORKERS", 1)
+
+    devices = USBDeviceManager().iter_devices()
+    assert next(devices).serial_number == "SN0"
+    devices.close()
+
+    # Only the read that was already running when the consumer stopped completes
+    assert len(fake_usb.reads) <= 2
+    assert sorted(fake_usb.disposed) == [address for address, _index in sorted(fake_usb.reads)]
@@ -9,10 +9,80 @@ This module provides classes for accessing and managing USB devices:
 
 import logging
 import re
+import time
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 
+import usb.backend
+import usb.backend.libusb1
 import usb.core
 import usb.util
 
+from device_cache import DeviceEnumerationCache
+
+# Endpoint transfer type names, keyed by the low bits of bmAttributes
+ENDPOINT_TYPE_NAMES = {
+    usb.util.ENDPOINT_TYPE_CTRL: "Control",
+    usb.util.ENDPOINT_TYPE_ISO: "Isochronous",
+    usb.util.ENDPOINT_TYPE_BULK: "Bulk",
+    usb.util.ENDPOINT_TYPE_INTR: "Interrupt",
+}
+
+# Bus ID format: bus number, then a dot-separated port path (e.g. "20-4.2.1")
+_BUS_ID_RE = re.compile(r"^(\d+)-(\d+(?:\.\d+)*)$")
+
+# Cleaned string descriptors, keyed by (bus, port path, address, descriptor
+# index). Descriptors do not change while a device stays plugged in, so values
+# are shared by every USBDevice wrapping the same device in this process.
+_STRING_CACHE: dict[tuple[int, tuple[int, ...], int, int], str | None] = {}
+
+
+def get_backend() -> usb.backend.IBackend | None:
+    """Get the libusb 1.0 backend used for device enumeration.
+
+    pyusb loads the library once per process and returns the same backend on
+    later calls, instead of probing the available backends on each lookup.
+
+    Returns:
+        The libusb 1.0 backend, or None to let pyusb pick a backend itself.
+    """
+    return usb.backend.libusb1.get_backend()
+
+
+class _EnumerationCache:
+    """Process-wide cache of the most recent USB device enumeration.
+
+    Closely spaced lookups share one enumeration. Results older than
+    TTL_SECONDS are discarded so newly attached devices are picked up.
+    """
+
+    TTL_SECONDS = 0.5
+
+    _devices: list[usb.core.Device] | None = None
+    _timestamp = 0.0
+
+    @classmethod
+    def get(cls, backend: usb.backend.IBackend | None) -> tuple[list[usb.core.Device], float]:
+        """Get the connected devices, enumerating again if the cache expired.
+
+        Args:
+            backend: The pyusb backend to enumerate with.
+
+        Returns:
+            Tuple of (list of pyusb Device objects, time.monotonic() value
+            at which they were enumerated).
+        """
+        now = time.monotonic()
+        if cls._devices is None or now - cls._timestamp >= cls.TTL_SECONDS:
+            cls._devices = list(usb.core.find(find_all=True, backend=backend))
+            cls._timestamp = now
+        return cls._devices, cls._timestamp
+
+    @classmethod
+    def clear(cls) -> None:
+        """Discard the cached enumeration."""
+        cls._devices = None
+
 
 class USBDevice:
     """Wrapper class for USB device access via pyusb.
@@ -24,6 +94,8 @@ class USBDevice:
         bus_id: The bus identifier string (e.g., "20-4.2.1").
     """
 
+    __slots__ = ("device", "bus_id")
+
     def __init__(self, device: usb.core.Device) -> None:
         """Initialize USBDevice with a pyusb device.
 
@@ -32,10 +104,6 @@ class USBDevice:
         """
         self.device = device
         self.bus_id = self.build_bus_id(device)
-        self._manufacturer: str | None = None
-        self._product: str | None = None
-        self._serial_number: str | None = None
-        self._strings_loaded = False
 
     @staticmethod
     def clean_usb_string(value: str | None) -> str | None:
@@ -52,8 +120,8 @@ class USBDevice:
         """
         if value is None:
             return None
-        # Split at null character and take first part, then strip whitespace
-        cleaned = value.split("\x00")[0].strip()
+        # Keep the part before the first null character, then strip whitespace
+        cleaned = value.partition("\x00")[0].strip()
         return cleaned if cleaned else None
 
     @staticmethod
@@ -70,7 +138,7 @@ class USBDevice:
         """
         port_numbers = device.port_numbers
         if port_numbers:
-            port_path = ".".join(str(port) for port in port_numbers)
+            port_path = ".".join(map(str, port_numbers))
             return f"{device.bus}-{port_path}"
         return f"{device.bus}-{device.address}"
 
@@ -87,47 +155,55 @@ class USBDevice:
         Raises:
             ValueError: If the bus ID format is invalid.
         """
-        match = re.match(r"^(\d+)-(.+)$", bus_id)
+        match = _BUS_ID_RE.match(bus_id)
         if not match:
             raise ValueError(f"Invalid bus ID format: {bus_id}")
 
         bus_number = int(match.group(1))
-        port_path = match.group(2)
-        port_numbers = tuple(int(port) for port in port_path.split("."))
+        port_numbers = tuple(int(port) for port in match.group(2).split("."))
         return bus_number, port_numbers
 
-    def _load_strings(self) -> None:
-        """Load USB string descriptors from the device.
+    def _string_cache_key(self, index: int) -> tuple[int, tuple[int, ...], int, int]:
+        """Get the string cache key of a descriptor index of this device.
+
+        Args:
+            index: The string descriptor index.
 
-        This is done lazily to avoid claiming devices unnecessarily.
-        Errors are logged but don't raise exceptions.
+        Returns:
+            A (bus, port path, address, descriptor index) tuple.
         """
-        if self._strings_loaded:
-            return
+        device = self.device
+        return (device.bus, tuple(device.port_numbers or ()), device.address, index)
 
-        self._strings_loaded = True
-        logger = logging.getLogger(__name__)
+    def _read_string(self, index: int, name: str) -> str | None:
+        """Read and clean a USB string descriptor by index.
 
-        try:
-            if self.device.iManufacturer:
-                raw_manufacturer = usb.util.get_string(self.device, self.device.iManufacturer)
-                self._manufacturer = self.clean_usb_string(raw_manufacturer)
-        except (usb.core.USBError, ValueError) as error:
-            logger.debug("Could not read manufacturer string: %s", error)
+        Strings are read lazily, one field at a time, to avoid claiming
+        devices unnecessarily. Errors are logged but don't raise exceptions.
+        Results are cached for the process lifetime per device and
+        descriptor index, so each string is only read from the device once.
 
-        try:
-            if self.device.iProduct:
-                raw_product = usb.util.get_string(self.device, self.device.iProduct)
-                self._product = self.clean_usb_string(raw_product)
-        except (usb.core.USBError, ValueError) as error:
-            logger.debug("Could not read product string: %s", error)
+        Args:
+            index: The string descriptor index (0 means no string).
+            name: Name of the field, used in log messages.
+
+        Returns:
+            The cleaned string, or None if absent or unreadable.
+        """
+        if not index:
+            return None
+        cache_key = self._string_cache_key(index)
+        if cache_key in _STRING_CACHE:
+            return _STRING_CACHE[cache_key]
 
+        value = None
         try:
-            if self.device.iSerialNumber:
-                raw_serial = usb.util.get_string(self.device, self.device.iSerialNumber)
-                self._serial_number = self.clean_usb_string(raw_serial)
+            value = self.clean_usb_string(usb.util.get_string(self.device, index))
         except (usb.core.USBError, ValueError) as error:
-            logger.debug("Could not read serial number string: %s", error)
+            logging.getLogger(__name__).debug("Could not read %s string: %s", name, error)
+
+        _STRING_CACHE[cache_key] = value
+        return value
 
     @property
     def vendor_id(self) -> int:
@@ -142,27 +218,50 @@ class USBDevice:
     @property
     def manufacturer(self) -> str | None:
         """Get the manufacturer string of the device."""
-        self._load_strings()
-        return self._manufacturer
+        return self._read_string(self.device.iManufacturer, "manufacturer")
 
     @property
     def product(self) -> str | None:
         """Get the product string of the device."""
-        self._load_strings()
-        return self._product
+        return self._read_string(self.device.iProduct, "product")
 
     @property
     def serial_number(self) -> str | None:
         """Get the serial number string of the device."""
-        self._load_strings()
-        return self._serial_number
+        return self._read_string(self.device.iSerialNumber, "serial number")
+
+    def has_cached_strings(self) -> bool:
+        """Check whether the manufacturer, product and serial strings are cached.
+
+        Returns:
+            True if no string needs to be read from the device.
+        """
+        device = self.device
+        return all(
+            not index or self._string_cache_key(index) in _STRING_CACHE
+            for index in (device.iManufacturer, device.iProduct, device.iSerialNumber)
+        )
+
+    def prefetch_strings(self) -> None:
+        """Read the manufacturer, product and serial strings into the cache.
+
+        The device's resources are released afterwards, so prefetching many
+        devices does not keep their handles open.
+        """
+        device = self.device
+        try:
+            self._read_string(device.iManufacturer, "manufacturer")
+            self._read_string(device.iProduct, "product")
+            self._read_string(device.iSerialNumber, "serial number")
+        finally:
+            usb.util.dispose_resources(device)
 
     @property
     def device_id(self) -> str:
         """Get the device identity string (VID:PID:serial or VID:PID)."""
-        self._load_strings()
-        if self._serial_number:
-            return f"{self.vendor_id:04x}:{self.product_id:04x}:{self._serial_number}"
+        serial_number = self.serial_number
+        if serial_number:
+            return f"{self.vendor_id:04x}:{self.product_id:04x}:{serial_number}"
         return f"{self.vendor_id:04x}:{self.product_id:04x}"
 
     def to_dict(self) -> dict[str, str | None]:
@@ -309,34 +408,37 @@ class USBDevice:
 
         # Add configuration details
         for config in self.device:
-            lines.append(f"\nConfiguration {config.bConfigurationValue}:")
-            lines.append(f"  Total Length: {config.wTotalLength}")
-            lines.append(f"  Number of Interfaces: {config.bNumInterfaces}")
+            lines.extend(
+                (
+                    f"\nConfiguration {config.bConfigurationValue}:",
+                    f"  Total Length: {config.wTotalLength}",
+                    f"  Number of Interfaces: {config.bNumInterfaces}",
+                )
+            )
 
             for interface in config:
-                lines.append(
-                    f"\n  Interface {interface.bInterfaceNumber}, "
-                    f"Alt Setting {interface.bAlternateSetting}:"
+                lines.extend(
+                    (
+                        f"\n  Interface {interface.bInterfaceNumber}, "
+                        f"Alt Setting {interface.bAlternateSetting}:",
+                        f"    Class: 0x{interface.bInterfaceClass:02x}",
+                        f"    Subclass: 0x{interface.bInterfaceSubClass:02x}",
+                        f"    Protocol: 0x{interface.bInterfaceProtocol:02x}",
+                        f"    Number of Endpoints: {interface.bNumEndpoints}",
+                    )
                 )
-                lines.append(f"    Class: 0x{interface.bInterfaceClass:02x}")
-                lines.append(f"    Subclass: 0x{interface.bInterfaceSubClass:02x}")
-                lines.append(f"    Protocol: 0x{interface.bInterfaceProtocol:02x}")
-                lines.append(f"    Number of Endpoints: {interface.bNumEndpoints}")
 
                 for endpoint in interface:
-                    direction = "IN" if endpoint.bEndpointAddress & 0x80 else "OUT"
-                    transfer_type = {
-                        0: "Control",
-                        1: "Isochronous",
-                        2: "Bulk",
-                        3: "Interrupt",
-                    }.get(endpoint.bmAttributes & 0x03, "Unknown")
-                    lines.append(
-                        f"\n    Endpoint 0x{endpoint.bEndpointAddress:02x} "
-                        f"({direction}, {transfer_type}):"
+                    direction = "IN" if endpoint.bEndpointAddress & usb.util.ENDPOINT_IN else "OUT"
+                    transfer_type = ENDPOINT_TYPE_NAMES.get(endpoint.bmAttributes & 0x03, "Unknown")
+                    lines.extend(
+                        (
+                            f"\n    Endpoint 0x{endpoint.bEndpointAddress:02x} "
+                            f"({direction}, {transfer_type}):",
+                            f"      Max Packet Size: {endpoint.wMaxPacketSize}",
+                            f"      Interval: {endpoint.bInterval}",
+                        )
                     )
-                    lines.append(f"      Max Packet Size: {endpoint.wMaxPacketSize}")
-                    lines.append(f"      Interval: {endpoint.bInterval}")
 
         return "\n".join(lines)
 
@@ -348,9 +450,141 @@ class USBDeviceManager:
     and resolve bindings to current devices.
     """
 
-    def __init__(self) -> None:
-        """Initialize the USBDeviceManager."""
+    # Threads used to read string descriptors of several devices concurrently
+    PREFETCH_WORKERS = 8
+
+    def __init__(self, device_cache: DeviceEnumerationCache | None = None) -> None:
+        """Initialize the USBDeviceManager.
+
+        Devices are enumerated once, on first use, and the result is reused
+        by every lookup on this manager until rescan() is called.
+
+        Args:
+            device_cache: Optional persistent cache of string descriptors,
+                          loaded once on first enumeration and written by
+                          save_device_cache().
+        """
         self._logger = logging.getLogger(__name__)
+        self._device_cache = device_cache
+        self._device_cache_loaded = False
+        self._backend = get_backend()
+        self._devices: list[usb.core.Device] | None = None
+        self._enumerated_at = 0.0
+        self._bus_id_index: dict[tuple[int, tuple[int, ...]], usb.core.Device] | None = None
+        self._vid_pid_index: dict[tuple[int, int], list[usb.core.Device]] | None = None
+
+    def _enumerate(self) -> list[usb.core.Device]:
+        """Enumerate the connected USB devices.
+
+        The first call takes a snapshot from the process-wide enumeration
+        cache; later lookups on this manager reuse that snapshot. The
+        persistent device cache is loaded with the first snapshot only.
+
+        Returns:
+            List of pyusb Device objects.
+        """
+        if self._devices is None:
+            self._devices, self._enumerated_at = _EnumerationCache.get(self._backend)
+            if self._device_cache is not None and not self._device_cache_loaded:
+                self._device_cache_loaded = True
+                for key, value in self._device_cache.load().items():
+                    _STRING_CACHE.setdefault(key, value)
+        return self._devices
+
+    def rescan(self) -> None:
+        """Drop the enumeration snapshot so the next lookup sees the current bus.
+
+        Cached string descriptors are kept, since their keys include the
+        device address and change whenever a device is re-enumerated.
+        """
+        _EnumerationCache.clear()
+        self._devices = None
+        self._bus_id_index = None
+        self._vid_pid_index = None
+
+    def save_device_cache(self) -> None:
+        """Persist the string descriptors read so far to the device cache.
+
+        Failed or empty reads are not stored, so they are retried by the
+        next invocation (possibly with more privileges).
+        """
+        if self._device_cache is None:
+            return
+        self._device_cache.save(
+            {key: value for key, value in _STRING_CACHE.items() if value is not None}
+        )
+
+    def build_bus_id_index(self) -> dict[tuple[int, tuple[int, ...]], usb.core.Device]:
+        """Build an index of the connected devices by bus and port path.
+
+        Devices without port numbers are indexed by their address instead,
+        matching the fallback in USBDevice.build_bus_id. A device with a port
+        path takes precedence if both map to the same key.
+
+        Returns:
+            Dictionary mapping (bus_number, port_numbers) to pyusb devices.
+        """
+        if self._bus_id_index is None:
+            index: dict[tuple[int, tuple[int, ...]], usb.core.Device] = {}
+            address_fallbacks = []
+            for device in self._enumerate():
+                port_numbers = device.port_numbers
+                if port_numbers:
+                    index.setdefault((device.bus, tuple(port_numbers)), device)
+                else:
+                    address_fallbacks.append(device)
+            for device in address_fallbacks:
+                index.setdefault((device.bus, (device.address,)), device)
+            self._bus_id_index = index
+        return self._bus_id_index
+
+    def iter_devices(self) -> Generator[USBDevice, None, None]:
+        """Iterate over all available USB devices.
+
+        Strings that are not cached yet are read on a thread pool, since
+        each read is a blocking control transfer to an independent device.
+        Devices are still yielded in enumeration order.
+
+        Yields:
+            A USBDevice object for each connected device.
+        """
+        usb_devices = [USBDevice(device) for device in self._enumerate()]
+        needs_read = [not usb_device.has_cached_strings() for usb_device in usb_devices]
+        read_count = sum(needs_read)
+        if read_count < 2:
+            for usb_device, read in zip(usb_devices, needs_read, strict=True):
+                if read:
+                    usb_device.prefetch_strings()
+                yield usb_device
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.PREFETCH_WORKERS, read_count))
+        try:
+            futures = [
+                executor.submit(usb_device.prefetch_strings) if read else None
+                for usb_device, read in zip(usb_devices, needs_read, strict=True)
+            ]
+            for usb_device, future in zip(usb_devices, futures, strict=True):
+                if future is not None:
+                    future.result()
+                yield usb_device
+        finally:
+            # Do not wait for queued reads if the consumer stopped early
+            executor.shutdown(cancel_futures=True)
+
+    def build_vid_pid_index(self) -> dict[tuple[int, int], list[usb.core.Device]]:
+        """Build an index of the connected devices by vendor and product ID.
+
+        Returns:
+            Dictionary mapping (vendor_id, product_id) to the pyusb devices
+            with that identity, in enumeration order.
+        """
+        if self._vid_pid_index is None:
+            index: dict[tuple[int, int], list[usb.core.Device]] = {}
+            for device in self._enumerate():
+                index.setdefault((device.idVendor, device.idProduct), []).append(device)
+            self._vid_pid_index = index
+        return self._vid_pid_index
 
     def list_devices(self) -> list[USBDevice]:
         """List all available USB devices.
@@ -358,10 +592,9 @@ class USBDeviceManager:
         Returns:
             List of USBDevice objects for all connected devices.
         """
-        devices = usb.core.find(find_all=True)
-        return [USBDevice(device) for device in devices]
+        return list(self.iter_devices())
 
-    def find_by_bus_id(self, bus_id: str) -> "USBDevice" | None:
+    def find_by_bus_id(self, bus_id: str) -> USBDevice | None:
         """Find a device by its bus ID.
 
         Args:
@@ -371,34 +604,28 @@ class USBDeviceManager:
             The USBDevice if found, None otherwise.
         """
         try:
-            target_bus, target_ports = USBDevice.parse_bus_id(bus_id)
+            target = USBDevice.parse_bus_id(bus_id)
         except ValueError as error:
             self._logger.error("Invalid bus ID: %s", error)
             return None
 
-        devices = usb.core.find(find_all=True)
-
-        for device in devices:
-            if device.bus == target_bus:
-                port_numbers = device.port_numbers
-                if port_numbers:
-                    # Device has port numbers - match against port path
-                    if tuple(port_numbers) == target_ports:
-                        return USBDevice(device)
-                else:
-                    # Device has no port numbers - match against address
-                    # This handles the fallback case in build_bus_id
-                    if len(target_ports) == 1 and device.address == target_ports[0]:
-                        return USBDevice(device)
-
-        return None
+        started_at = time.monotonic()
+        device = self.build_bus_id_index().get(target)
+        if device is None and self._enumerated_at < started_at:
+            # The snapshot was taken before this lookup and may predate the
+            # device; a snapshot taken by this lookup is already current
+            self.rescan()
+            device = self.build_bus_id_index().get(target)
+        if device is None:
+            return None
+        return USBDevice(device)
 
     def find_by_identity(
         self,
         vendor_id: int,
         product_id: int,
         serial_number: str | None = None,
-    ) -> "USBDevice" | None:
+    ) -> USBDevice | None:
         """Find a device by VID, PID, and optionally serial number.
 
         Args:
@@ -409,26 +636,28 @@ class USBDeviceManager:
         Returns:
             The USBDevice if found, None otherwise.
         """
-        devices = usb.core.find(
-            find_all=True,
-            idVendor=vendor_id,
-            idProduct=product_id,
-        )
+        # Normalize both to empty string for comparison
+        # (binding stores "" for no serial, USBDevice returns None)
+        search_serial = serial_number or ""
+
+        for device in self.build_vid_pid_index().get((vendor_id, product_id), ()):
+            # Without a serial string descriptor the device's serial is empty,
+            # so it can be matched without any transfer to the device
+            if not device.iSerialNumber:
+                if not search_serial:
+                    return USBDevice(device)
+                continue
 
-        for device in devices:
             usb_device = USBDevice(device)
-
-            # Normalize both to empty string for comparison
-            # (binding stores "" for no serial, USBDevice returns None)
-            search_serial = serial_number or ""
-            device_serial = usb_device.serial_number or ""
-
-            if search_serial == device_serial:
+            if search_serial == (usb_device.serial_number or ""):
                 return usb_device
 
+            # Release the handle opened to read the serial of a non-match
+            usb.util.dispose_resources(device)
+
         return None
 
-    def find_by_binding(self, binding: dict[str, str]) -> "USBDevice" | None:
+    def find_by_binding(self, binding: dict[str, str]) -> USBDevice | None:
         """Find a device that matches a binding configuration.
 
         The binding dictionary should contain 'vendor_id', 'product_id',
@@ -185,7 +185,7 @@ class USBIPServer:
                     bus_id_data = self._recv_exact(client_socket, 32)
                     if not bus_id_data:
                         break
-                    bus_id = bus_id_data.rstrip(b"\x00").decode("utf-8")
+                    bus_id = bus_id_data.partition(b"\x00")[0].decode("utf-8")
                     if self._handle_import_request(client_socket, bus_id):
                         # Keep connection open for URB traffic
                         self._handle_urb_traffic(client_socket, bus_id)
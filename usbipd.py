@@ -6,11 +6,35 @@
 import argparse
 import logging
 import sys
+from collections.abc import Iterable, Set
 from importlib.metadata import PackageNotFoundError, version
-
-from binding_configuration import BindingConfiguration
-from usb_device import USBDevice, USBDeviceManager
-from usbip_server import USBIPServer
+from typing import TYPE_CHECKING
+
+from binding_configuration import get_binding_configuration
+from device_cache import DeviceEnumerationCache
+
+# pyusb and the server are imported by the commands that need them, so help
+# output and configuration-only commands do not load libusb
+if TYPE_CHECKING:
+    from usb_device import USBDevice, USBDeviceManager
+
+# Separator lines for the device table
+TITLE_SEPARATOR = "=" * 110
+TABLE_SEPARATOR = "-" * 110
+
+# Row layout for the device table; precision specs truncate overlong values
+TABLE_ROW_FORMAT = (
+    "{bus_id:<14.14} {vid_pid:<12} {manufacturer:<20.20} {product:<26.26} "
+    "{serial:<20.20} {state:<10}"
+)
+TABLE_HEADER = TABLE_ROW_FORMAT.format(
+    bus_id="BUSID",
+    vid_pid="VID:PID",
+    manufacturer="Manufacturer",
+    product="Product",
+    serial="Serial",
+    state="State",
+)
 
 
 def get_version() -> str:
@@ -25,6 +49,17 @@ def get_version() -> str:
         return "unknown (not installed as package)"
 
 
+def get_device_manager() -> "USBDeviceManager":
+    """Create a device manager backed by the persistent descriptor cache.
+
+    Returns:
+        A new USBDeviceManager instance.
+    """
+    from usb_device import USBDeviceManager
+
+    return USBDeviceManager(device_cache=DeviceEnumerationCache())
+
+
 def setup_logging(verbose: bool = False) -> None:
     """Configure logging for the application.
 
@@ -39,51 +74,59 @@ def setup_logging(verbose: bool = False) -> None:
     )
 
 
-def print_devices_table(devices: list[USBDevice], config: BindingConfiguration) -> None:
+def print_devices_table(
+    devices: Iterable["USBDevice"], bound_identities: Set[tuple[str, str, str]]
+) -> int:
     """Print USB device information in a formatted table.
 
-    Args:
-        devices: A list of USBDevice objects.
-        config: The binding configuration to check device state.
-    """
-    if not devices:
-        print("No USB devices found.")
-        return
+    Rows are written as the devices are produced, so output starts before
+    the enumeration has finished.
 
-    print(
-        f"{'BUSID':<14} {'VID:PID':<12} {'Manufacturer':<20} {'Product':<26} "
-        f"{'Serial':<20} {'State':<10}"
-    )
-    print("-" * 110)
+    Args:
+        devices: An iterable of USBDevice objects.
+        bound_identities: The (vendor_id, product_id, serial_number) tuples
+            of all bound devices, used to show each device's state.
 
+    Returns:
+        The number of devices printed.
+    """
+    device_count = 0
     for device in devices:
-        vid_pid = f"{device.vendor_id:04x}:{device.product_id:04x}"
-        is_device_bound = config.is_bound(
-            f"{device.vendor_id:04x}",
-            f"{device.product_id:04x}",
-            device.serial_number or "",
-        )
-        state = "Bound" if is_device_bound else "Not bound"
-        bus_id = device.bus_id[:14]
-        manufacturer = (device.manufacturer or "Unknown")[:20]
-        product = (device.product or "Unknown")[:26]
-        serial = (device.serial_number or "N/A")[:20]
+        if not device_count:
+            print(TABLE_HEADER)
+            print(TABLE_SEPARATOR)
+        device_count += 1
+
+        vendor_id = f"{device.vendor_id:04x}"
+        product_id = f"{device.product_id:04x}"
+        is_device_bound = (vendor_id, product_id, device.serial_number or "") in bound_identities
         print(
-            f"{bus_id:<14} {vid_pid:<12} {manufacturer:<20} {product:<26} {serial:<20} {state:<10}"
+            TABLE_ROW_FORMAT.format(
+                bus_id=device.bus_id,
+                vid_pid=f"{vendor_id}:{product_id}",
+                manufacturer=device.manufacturer or "Unknown",
+                product=device.product or "Unknown",
+                serial=device.serial_number or "N/A",
+                state="Bound" if is_device_bound else "Not bound",
+            )
         )
 
+    if not device_count:
+        print("No USB devices found.")
+    return device_count
+
 
 def command_list() -> None:
     """Handle the 'list' command to display all connected USB devices."""
     print("USB Device List")
-    print("=" * 110)
+    print(TITLE_SEPARATOR)
 
-    config = BindingConfiguration()
-    manager = USBDeviceManager()
-    devices = manager.list_devices()
+    config = get_binding_configuration()
+    manager = get_device_manager()
 
-    print_devices_table(devices, config)
-    print(f"\nTotal devices found: {len(devices)}")
+    device_count = print_devices_table(manager.iter_devices(), config.get_bound_identities())
+    print(f"\nTotal devices found: {device_count}")
+    manager.save_device_cache()
 
 
 def command_bind(bus_id: str) -> None:
@@ -95,7 +138,7 @@ def command_bind(bus_id: str) -> None:
     Args:
         bus_id: The bus ID of the device to bind (format: bus-port, e.g., 1-3).
     """
-    manager = USBDeviceManager()
+    manager = get_device_manager()
     usb_device = manager.find_by_bus_id(bus_id)
 
     if usb_device is None:
@@ -103,7 +146,7 @@ def command_bind(bus_id: str) -> None:
         sys.exit(1)
 
     # Save binding to configuration using VID:PID:serial
-    config = BindingConfiguration()
+    config = get_binding_configuration()
     added = config.add_binding(
         vendor_id=f"{usb_device.vendor_id:04x}",
         product_id=f"{usb_device.product_id:04x}",
@@ -115,6 +158,7 @@ def command_bind(bus_id: str) -> None:
         print(usb_device.get_detailed_info())
     else:
         print(f"Device is already bound: {bus_id}")
+    manager.save_device_cache()
 
 
 def command_unbind(bus_id: str | None = None, unbind_all: bool = False) -> None:
@@ -127,7 +171,7 @@ def command_unbind(bus_id: str | None = None, unbind_all: bool = False) -> None:
         bus_id: The bus ID of the device to unbind (format: bus-port.port...).
         unbind_all: If True, remove all bindings.
     """
-    config = BindingConfiguration()
+    config = get_binding_configuration()
 
     if unbind_all:
         count = config.clear_all_bindings()
@@ -142,7 +186,7 @@ def command_unbind(bus_id: str | None = None, unbind_all: bool = False) -> None:
         sys.exit(1)
 
     # Look up the device to get its VID:PID:serial
-    manager = USBDeviceManager()
+    manager = get_device_manager()
     usb_device = manager.find_by_bus_id(bus_id)
 
     if usb_device is None:
@@ -154,6 +198,7 @@ def command_unbind(bus_id: str | None = None, unbind_all: bool = False) -> None:
         f"{usb_device.product_id:04x}",
         usb_device.serial_number or "",
     )
+    manager.save_device_cache()
 
     if removed:
         print(f"Device unbound successfully: {usb_device.device_id} (at {bus_id})")
@@ -164,22 +209,23 @@ def command_unbind(bus_id: str | None = None, unbind_all: bool = False) -> None:
 
 def command_start(host: str | None = None, ipv4_only: bool = False) -> None:
     """Handle the 'start' command to start the USBIP server."""
+    # Load bound devices from configuration
+    bindings = get_binding_configuration().get_all_bindings()
+    if not bindings:
+        print("No devices are bound. Use 'usbipd bind --bus-id <bus-id>' to bind devices first.")
+        sys.exit(1)
+
+    from usbip_server import USBIPServer
+
     if host is not None:
         server = USBIPServer(host=host)
     elif ipv4_only:
         server = USBIPServer(host="0.0.0.0")
     else:
         server = USBIPServer()
-    manager = USBDeviceManager()
-
-    # Load bound devices from configuration and export them
-    config = BindingConfiguration()
-    bindings = config.get_all_bindings()
-
-    if not bindings:
-        print("No devices are bound. Use 'usbipd bind --bus-id <bus-id>' to bind devices first.")
-        sys.exit(1)
+    manager = get_device_manager()
 
+    # Export the bound devices that are connected
     exported_count = 0
     for binding in bindings:
         device_id = f"{binding['vendor_id']}:{binding['product_id']}"
@@ -201,6 +247,8 @@ def command_start(host: str | None = None, ipv4_only: bool = False) -> None:
                 file=sys.stderr,
             )
 
+    manager.save_device_cache()
+
     if exported_count == 0:
         print("No devices could be exported. Check that bound devices are still connected.")
         sys.exit(1)
@@ -211,13 +259,21 @@ def command_start(host: str | None = None, ipv4_only: bool = False) -> None:
     except KeyboardInterrupt:
         print("\nServer stopped by user.")
         server.stop()
-    except Exception as error:
+    except (OSError, RuntimeError) as error:
         print(f"Failed to start USBIP server: {error}", file=sys.stderr)
         sys.exit(1)
+    except Exception:
+        # Unexpected errors keep their traceback, but the socket is released
+        server.stop()
+        raise
 
 
-def main() -> None:
-    """Main entry point for usbipd."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser.
+
+    Returns:
+        The argument parser with all subcommands.
+    """
     parser = argparse.ArgumentParser(
         prog="usbipd",
         description="USB over IP daemon utility for macOS - manage and share USB devices.",
@@ -282,7 +338,30 @@ def main() -> None:
         dest="host",
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point for usbipd.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv[1:].
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Plain "list" and "start" need no parsing, so skip building the parser
+    if argv == ["list"]:
+        setup_logging()
+        command_list()
+        return
+    if argv == ["start"]:
+        setup_logging()
+        command_start()
+        return
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
     # Setup logging
     setup_logging(verbose=args.verbose)